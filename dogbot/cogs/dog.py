@@ -1,14 +1,22 @@
+import asyncio
+import logging
+from typing import Callable
+
 import disnake
 from disnake import Member
 from disnake.ext import commands
 from disnake.ext.commands import Context
 from peewee import fn, DoesNotExist
 
+from dogbot.helpers import member_cache
+from dogbot.orm.controllers.dog_act_controller import DogActController
 from dogbot.orm.database import dog_bot_database_proxy
+from dogbot.orm.migrations import merge_split_vote_tables
 from dogbot.orm.models.dog_act import DogAct
 from dogbot.orm.models.member import Member as DogbotMember
-from orm.controllers.dog_act_controller import DogActController
-from orm.models.votes import YesVote, NoVote
+from dogbot.orm.models.votes import Vote
+
+logger = logging.getLogger(__name__)
 
 
 class DogChoice(disnake.ui.View):
@@ -18,35 +26,41 @@ class DogChoice(disnake.ui.View):
     processed.
 
     Users are able to swap their votes as they see fit, until voting closes.
+    Each vote updates the message in place as part of responding to the interaction, so a single view is used for the
+    whole trial.
     Once the required number of votes for a particular option have been cast, a decision is reached and the choices end.
     If there aren't enough choices by the duration of _timeout_sec then the target is presumed innocent.
     """
 
-    def __init__(self, dog_act_controller: DogActController, timeout_sec: int = 5 * 60):
+    def __init__(self, dog_act_controller: DogActController, context: Context, timeout_sec: int = 5 * 60):
         """
         :param dog_act_controller: Dog act that is being voted on by this Dog choice.
+        :param context: Discord context of the command that started the vote, used to look up the members involved.
         :param timeout_sec: Seconds to wait before this view times out and is no longer valid.
         """
         super().__init__()
         self.dog_act_controller = dog_act_controller
+        self.context = context
         self.timeout = timeout_sec
+        # Only the description changes as voting progresses, so the same embed is reused for every update.
+        self.embed = disnake.Embed(colour=0x9C84EF)
+        # Votes are recorded away from the event loop, but still one at a time along with the response to each, so that
+        # each sees the ones before it.
+        self._vote_lock = asyncio.Lock()
+        # Set once on_timeout has finished, since the view counts as finished before it runs.
+        self._timeout_handled = asyncio.Event()
 
     @disnake.ui.button(label="Definitely a dog", style=disnake.ButtonStyle.blurple)
     async def yes_button(self, _: disnake.ui.Button, interaction: disnake.MessageInteraction) -> None:
         """
         Generates the 'yes' option. Clicking this button causes the clicker to be added to the 'yes' votes list.
         To avoid adding the same user multiple times, their votes are cleared before adding them to the correct list.
-        Once the vote has been counted, the view is exited, and the message can be updated as required.
+        Once the vote has been counted, the message is updated to show the current status of voting.
 
         :param _: Unused parameter for the button the user can click.
         :param interaction: Details about the interaction that occurred with the button.
         """
-        self.dog_act_controller.add_new_yes_vote(interaction.author.id)
-
-        # When a user initiates a click, we need to do something as a result, or they never receive anything back.
-        # Defer prevents them from receiving the 'Interaction failed' message.
-        await interaction.response.defer()
-        self.stop()
+        await self._cast_vote(interaction, self.dog_act_controller.add_new_yes_vote)
 
     @disnake.ui.button(label="Not a dog", style=disnake.ButtonStyle.blurple)
     async def no_button(self, _: disnake.ui.Button, interaction: disnake.MessageInteraction) -> None:
@@ -56,20 +70,195 @@ class DogChoice(disnake.ui.View):
         :param _: Unused parameter for the button the user can click.
         :param interaction: Details about the interaction that occurred with the button.
         """
-        self.dog_act_controller.add_new_no_vote(interaction.author.id)
+        await self._cast_vote(interaction, self.dog_act_controller.add_new_no_vote)
+
+    async def _cast_vote(self, interaction: disnake.MessageInteraction, add_vote: Callable[[int], bool]) -> None:
+        """
+        Records the vote of the member that clicked a button, and responds to it.
+        Votes are only counted until the view finishes, whether that's because of a verdict or a timeout.
+
+        :param interaction: Details about the interaction that occurred with the button.
+        :param add_vote: Controller method that adds the vote, such as :meth:`DogActController.add_new_yes_vote`.
+        """
+        async with self._vote_lock:
+            # Once a verdict has been reached or the view has timed out, the trial is over and votes no longer count.
+            # A verdict is only posted after it's been reached, so the view may not have finished yet.
+            if self.is_finished() or self.dog_act_controller.vote_outcome() is not None:
+                await interaction.response.defer()
+                return
+
+            vote_changed = await asyncio.to_thread(_record_vote, add_vote, interaction.author.id)
+
+            # The view may have timed out while the vote was being recorded. The outcome is then posted once the
+            # timeout has been handled, rather than in response to this vote.
+            if self.is_finished():
+                await interaction.response.defer()
+                return
+
+            # Responding before letting the next vote in means the message can't be edited out of order, such as the
+            # current tally replacing the verdict.
+            await self._respond_to_vote(interaction, vote_changed)
+
+    async def _respond_to_vote(self, interaction: disnake.MessageInteraction, vote_changed: bool) -> None:
+        """
+        Responds to a vote being cast. While voting is still open, the message is edited to show the current status of
+        the trial as the response to the interaction. Once an outcome has been reached, the verdict is posted in the
+        same way and the view is exited.
+
+        :param interaction: Details about the interaction that occurred with the button.
+        :param vote_changed: Whether the vote changed anything. If it didn't, the message is left as it is.
+        """
+        if not vote_changed:
+            # When a user initiates a click, we need to do something as a result, or they never receive anything back.
+            # Defer prevents them from receiving the 'Interaction failed' message.
+            await interaction.response.defer()
+            return
+
+        if self.dog_act_controller.vote_outcome() is None:
+            await interaction.response.edit_message(embed=await self.update_embed(), view=self)
+            return
 
-        # When a user initiates a click, we need to do something as a result, or they never receive anything back.
-        # Defer prevents them from receiving the 'Interaction failed' message.
-        await interaction.response.defer()
+        # Responding with the verdict removes the buttons, and saves editing the message again once voting finishes.
+        # The view is stopped first, so that it can't time out while the verdict is being posted.
         self.stop()
+        self.embed.description = await self.dog_act_controller.create_outcome_message(self.context)
+        await interaction.response.edit_message(embed=self.embed, view=None)
+
+    async def update_embed(self) -> disnake.Embed:
+        """
+        Updates the embed to show the current status of the dog act being voted on.
+
+        :return: The updated embed.
+        """
+        self.embed.description = await self.dog_act_controller.create_updated_dog_act_message(self.context)
+        return self.embed
 
     async def on_timeout(self) -> None:
         """
         Overrides what to do when the view times out.
         On Timeout, the dog act is updated, and we cancel waiting.
+        If the vote already reached an outcome, the timeout is ignored so that it can't overturn the verdict.
         """
-        self.dog_act_controller.time_out()
-        self.stop()
+        try:
+            # A vote that was still being recorded when the view timed out is counted before checking for an outcome,
+            # so that it can't reach a verdict after the dog act has been timed out.
+            async with self._vote_lock:
+                if self.dog_act_controller.vote_outcome() is not None:
+                    return
+                self.dog_act_controller.time_out()
+            self.stop()
+        finally:
+            self._timeout_handled.set()
+
+    async def wait(self) -> bool:
+        """
+        Waits until voting has finished, either because an outcome was reached or because the view timed out.
+        A view stops waiting as soon as it times out, before :meth:`on_timeout` has run, so this also waits for the
+        timeout to be handled.
+
+        :return: Whether the view timed out.
+        """
+        timed_out = await super().wait()
+        if timed_out:
+            await self._timeout_handled.wait()
+        return timed_out
+
+
+# The top dogs for each server, keyed by guild ID. The leaderboard only changes when a verdict is saved, so it's kept
+# until then rather than being aggregated again for every request.
+_top_dog_ids_by_guild: dict[int, list[int]] = {}
+# How many times each server's leaderboard has been invalidated, keyed by guild ID. Used to notice when a verdict is
+# saved while the leaderboard is being queried, so that the stale result isn't cached.
+_top_dog_invalidations_by_guild: dict[int, int] = {}
+
+
+def _invalidate_top_dogs(guild_id: int) -> None:
+    """
+    Forgets the cached leaderboard for a server, so that it's queried again the next time it's needed.
+    Should be called whenever a dog act's verdict is saved.
+
+    :param guild_id: Server that the verdict was reached within.
+    """
+    _top_dog_ids_by_guild.pop(guild_id, None)
+    _top_dog_invalidations_by_guild[guild_id] = _top_dog_invalidations_by_guild.get(guild_id, 0) + 1
+
+
+async def _get_top_dog_ids(guild_id: int) -> list[int]:
+    """
+    Retrieves the members that have been found guilty of the most dog acts on a server, using the cached leaderboard
+    when it's available.
+
+    :param guild_id: Server to find the top dogs for.
+    :return: IDs of the top 3 dogs, worst first.
+    """
+    top_dog_ids = _top_dog_ids_by_guild.get(guild_id)
+    if top_dog_ids is None:
+        invalidations = _top_dog_invalidations_by_guild.get(guild_id, 0)
+        # Run the aggregate in a thread, so it doesn't hold up the event loop while the table is scanned.
+        top_dog_ids = await asyncio.to_thread(_query_top_dog_ids, guild_id)
+        if invalidations == _top_dog_invalidations_by_guild.get(guild_id, 0):
+            _top_dog_ids_by_guild[guild_id] = top_dog_ids
+    return top_dog_ids
+
+
+def _query_top_dog_ids(guild_id: int) -> list[int]:
+    """
+    Finds the members that have been found guilty of the most dog acts on a server.
+    This blocks on the database, so should be run in a thread rather than on the event loop.
+
+    :param guild_id: Server to find the top dogs for.
+    :return: IDs of the top 3 dogs, worst first.
+    """
+    # Each thread gets its own connection, so make sure it doesn't outlive the query.
+    with dog_bot_database_proxy.connection_context():
+        # Only the IDs are needed, so skip building a model instance for every row.
+        return [target_id for target_id, _ in
+                DogAct.select(DogAct.target, fn.Count(1).alias('count')).where(
+                    (DogAct.guild_id == guild_id) & (DogAct.found_guilty == 1)).group_by(DogAct.target).order_by(
+                    'count desc').limit(3).tuples()]
+
+
+def _query_dog_history(guild_id: int, target_id: int, limit: int) -> tuple[list[str], int]:
+    """
+    Summarises the most recent dog acts that a member has been accused of on a server.
+    This blocks on the database, so should be run in a thread rather than on the event loop.
+
+    :param guild_id: Server that the dog acts occurred within.
+    :param target_id: Member that was accused in the dog acts.
+    :param limit: Maximum number of dog acts to summarise.
+    :return: Summaries of the dog acts, newest first, and how many dog acts the member has been found guilty of.
+    """
+    # Each thread gets its own connection, so make sure it doesn't outlive the queries.
+    with dog_bot_database_proxy.connection_context():
+        # Count the votes on each dog act as part of the same query, rather than counting them for each dog act.
+        yes_vote_count = Vote.select(fn.Count(1)).where((Vote.dog_act == DogAct.id) & Vote.is_yes)
+        no_vote_count = Vote.select(fn.Count(1)).where((Vote.dog_act == DogAct.id) & ~Vote.is_yes)
+        dog_acts = DogAct.select(DogAct, yes_vote_count.alias('yes_vote_count'),
+                                 no_vote_count.alias('no_vote_count')).where(
+            (DogAct.guild_id == guild_id) & (DogAct.target == target_id)).order_by(DogAct.id.desc()).limit(limit)
+        history = [DogActController(dog_act).create_history_summary(dog_act.yes_vote_count, dog_act.no_vote_count)
+                   for dog_act in dog_acts]
+
+        # It's fun to know how many times someone has been a dog! Counted by the database across all of their dog acts,
+        # rather than only those in the history.
+        total_guilty_acts = DogAct.select().where(
+            (DogAct.guild_id == guild_id) & (DogAct.target == target_id) & (DogAct.found_guilty == 1)).count()
+
+    return history, total_guilty_acts
+
+
+def _record_vote(add_vote: Callable[[int], bool], author: int) -> bool:
+    """
+    Records a vote on a dog act.
+    This blocks on the database, so should be run in a thread rather than on the event loop.
+
+    :param add_vote: Controller method that adds the vote, such as :meth:`DogActController.add_new_yes_vote`.
+    :param author: ID of the Discord Member casting the vote.
+    :return: Whether the vote changed anything.
+    """
+    # Each thread gets its own connection, so make sure it doesn't outlive the vote.
+    with dog_bot_database_proxy.connection_context():
+        return add_vote(author)
 
 
 async def send_top_dogs(context: Context, tag_dogs: bool) -> None:
@@ -78,15 +267,20 @@ async def send_top_dogs(context: Context, tag_dogs: bool) -> None:
     :param context: Discord context for sending messages and retrieving member details.
     :param tag_dogs: Whether to explicitly tag the dogs in the message.
     """
-    top_dogs: list[str] = []
-    for dog_act in DogAct.select(DogAct.target, fn.Count(DogAct.target).alias('count')).where(
-            (DogAct.guild_id == context.guild.id) & (DogAct.found_guilty == 1)).group_by(DogAct.target).order_by(
-        'count desc').limit(3):
-        top_dog = await context.guild.get_or_fetch_member(dog_act.target)
-        if tag_dogs:
-            top_dogs.append(top_dog.mention)
-        else:
-            top_dogs.append(top_dog.name)
+    top_dog_ids = await _get_top_dog_ids(context.guild.id)
+    # Nobody has been found guilty on this server yet, so there's nobody to look up.
+    if not top_dog_ids:
+        embed = disnake.Embed(title=":dog: Worst 3 Dogs :dog:", description="No dogs yet!", colour=0x9C84EF)
+        await context.send(embed=embed)
+        return
+
+    # Fetch the members all at once rather than waiting on each one in turn, keeping them in leaderboard order.
+    top_dog_members = await asyncio.gather(*(member_cache.get_or_fetch_member(context.guild, top_dog_id)
+                                             for top_dog_id in top_dog_ids))
+    if tag_dogs:
+        top_dogs = [top_dog.mention for top_dog in top_dog_members]
+    else:
+        top_dogs = [top_dog.name for top_dog in top_dog_members]
 
     message_rows = []
     if len(top_dogs) > 0:
@@ -111,13 +305,17 @@ class Dog(commands.Cog, name="dog"):
     """
 
     def __init__(self, bot):
-        dog_bot_database_proxy.connect()
-        dog_bot_database_proxy.create_tables([DogAct, DogbotMember, YesVote, NoVote])
-        dog_bot_database_proxy.close()
+        # The connection is kept open for the lifetime of the bot, rather than being reopened for every query.
+        dog_bot_database_proxy.connect(reuse_if_open=True)
+        dog_bot_database_proxy.create_tables([DogAct, DogbotMember, Vote])
+        merge_split_vote_tables()
 
         self._votes_per_dog_act = bot.config.dog_act_votes
         self._dog_act_timeout_sec = bot.config.dog_act_timeout_sec
 
+        # Dog acts that are currently being voted on, keyed by their ID. Entries are removed once a verdict is reached.
+        self._active_dog_acts: dict[int, DogActController] = {}
+
     @commands.command(
         name="dog",
         description="Reports someone for dogging."
@@ -135,15 +333,12 @@ class Dog(commands.Cog, name="dog"):
         :param context: The application command interaction.
         :param reason: Why what they did was considered a dog move.
         """
-        member = await context.guild.get_or_fetch_member(tagged_user.id)
-
         # Initialise the users that were mentioned in this dog act. They need to already exist when we create a dog act,
-        # or we'll run into foreign key reference issues.
-        DogbotMember.get_or_create(id=context.author.id)
-        DogbotMember.get_or_create(id=member.id)
+        # or we'll run into foreign key reference issues. Any that already exist are left as they are.
+        DogbotMember.insert_many([{'id': context.author.id}, {'id': tagged_user.id}]).on_conflict_ignore().execute()
 
         # Initialise the dog act, recording details about the message.
-        dog_act = DogAct.create(reporter=context.author.id, target=member.id, allegation=reason,
+        dog_act = DogAct.create(reporter=context.author.id, target=tagged_user.id, allegation=reason,
                                 guild_id=context.guild.id, required_votes=self._votes_per_dog_act)
         dog_act_controller = DogActController(dog_act)
 
@@ -151,8 +346,11 @@ class Dog(commands.Cog, name="dog"):
 
         # Save everything that's been done to this dog_act.
         dog_act.save()
+        _invalidate_top_dogs(dog_act.guild_id)
 
-        print(await dog_act_controller.create_detailed_outcome_message(context))
+        # The detailed outcome looks up every voter, so only build it when it's actually going to be logged.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(await dog_act_controller.create_detailed_outcome_message(context))
 
     @commands.command(
         name="dogrevote",
@@ -176,62 +374,73 @@ class Dog(commands.Cog, name="dog"):
             await context.send(embed=embed)
             return
 
+        if act_id in self._active_dog_acts:
+            embed = disnake.Embed(title="Hold your horses!",
+                                  description="That dog act is still being voted on.")
+            await context.send(embed=embed)
+            return
+
         dog_act_controller: DogActController = DogActController(dog_act)
 
         # Only allow appeals once, unless it's the bot owner just in case are really annoyed.
-        if dog_act.appeal_attempted and context.author.id not in context.bot.config.owners:
+        if dog_act.appeal_attempted and context.author.id not in context.bot.owner_ids:
             embed = disnake.Embed(title="Don't you dare!",
                                   description="An appeal can only be attempted once per dog act.")
             await context.send(embed=embed)
             return
 
+        # Remember the verdict and votes before the re-vote, in case the appeal doesn't reach an outcome.
+        found_guilty_before_appeal = dog_act.found_guilty
+        timed_out_before_appeal = dog_act.timed_out
+        yes_votes_before_appeal, no_votes_before_appeal = dog_act_controller.get_votes()
+
         dog_act_controller.begin_appeal_and_save(reason)
         dog_act_controller.reset_voting()
         await self.vote_on_dog_act(context, dog_act_controller)
 
-        # Save everything that's been done to this dog act if we didn't time out,
-        # otherwise revert to the data before the re-vote (including the appeal being recorded).
+        # If the re-vote timed out, the verdict and the votes that reached it are put back as they were before the
+        # appeal. The appeal itself stays recorded, so it counts as the one attempt.
         if dog_act.timed_out:
-            # Reset the dog act and mark it as appeal failed.
-            dog_act = DogAct.select().where(DogAct.id == act_id).limit(1)
+            dog_act.found_guilty = found_guilty_before_appeal
+            dog_act.timed_out = timed_out_before_appeal
+            dog_act_controller.restore_votes(yes_votes_before_appeal, no_votes_before_appeal)
 
         # Regardless of the outcome, save the changes.
         dog_act.save()
+        _invalidate_top_dogs(dog_act.guild_id)
 
-        print(await dog_act_controller.create_detailed_outcome_message(context))
+        # The detailed outcome looks up every voter, so only build it when it's actually going to be logged.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(await dog_act_controller.create_detailed_outcome_message(context))
 
     async def vote_on_dog_act(self, context: Context, dog_act_controller: DogActController) -> None:
         """
-        Manages the dog act message, listening for Member interaction and updating the message as they occur.
+        Sends the dog act message and waits for Member interaction to reach an outcome, making sure the verdict is
+        posted.
 
         :param context: Discord context attached to the message.
         :param dog_act_controller: Dog act being acted upon by the user.
         """
 
-        # Continue waiting for user input until an outcome has been reached.
-        message = None
-        while dog_act_controller.vote_outcome() is None:
-            # Set the embed to the current status of the trial.
-            embed = disnake.Embed(description=await dog_act_controller.create_updated_dog_act_message(context),
-                                  colour=0x9C84EF)
+        dog_act_id = dog_act_controller.dog_act.id
+        self._active_dog_acts[dog_act_id] = dog_act_controller
+        try:
             # Timeout after an hour (1hr * 60 min * 60 sec).
-            choices = DogChoice(dog_act_controller, timeout_sec=self._dog_act_timeout_sec)
-
-            # Initialise the message if required, otherwise update it to match the changes made by the most recent
-            # interaction.
-            if message is None:
-                message = await context.send(embed=embed, view=choices)
-
-                # Assign the newly created message to our record for future reference.
-                dog_act_controller.set_message_id(message.id)
-            else:
-                await message.edit(embed=embed, view=choices)
-
-            # Don't do anything until another interaction occurs.
-            await choices.wait()
-
-        embed = disnake.Embed(description=await dog_act_controller.create_outcome_message(context))
-        await message.edit(embed=embed, view=None)
+            choices = DogChoice(dog_act_controller, context, timeout_sec=self._dog_act_timeout_sec)
+            message = await context.send(embed=await choices.update_embed(), view=choices)
+
+            # Assign the newly created message to our record for future reference.
+            dog_act_controller.set_message_id(message.id)
+
+            # The view keeps the message up to date and only finishes once an outcome has been reached or it times out.
+            # A vote that reaches an outcome posts the verdict itself, so only a timeout needs the message updated.
+            if await choices.wait():
+                embed = choices.embed
+                embed.description = await dog_act_controller.create_outcome_message(context)
+                await message.edit(embed=embed, view=None)
+        finally:
+            # Finished trials don't need to be tracked any more.
+            self._active_dog_acts.pop(dog_act_id, None)
 
     @commands.command(
         name="tagdogs",
@@ -269,17 +478,9 @@ class Dog(commands.Cog, name="dog"):
         else:
             normalised_limit = limit
 
-        history: list[str] = []
-        total_guilty_acts = 0
-        for dog_act in DogAct.select().where(
-                (DogAct.guild_id == context.guild.id) & (DogAct.target == tagged_user.id)).order_by(
-            DogAct.id.desc()).limit(normalised_limit):
-            dog_act_controller = DogActController(dog_act)
-            history.append(dog_act_controller.create_history_summary())
-
-            # It's fun to know how many times someone has been a dog!
-            if dog_act.found_guilty:
-                total_guilty_acts += 1
+        # Run the queries in a thread, so they don't hold up the event loop.
+        history, total_guilty_acts = await asyncio.to_thread(_query_dog_history, context.guild.id, tagged_user.id,
+                                                             normalised_limit)
 
         embed = disnake.Embed(title=f"Dog history for {tagged_user.name}",
                               description=f"Total dog acts: **{total_guilty_acts}**\n" +
@@ -7,6 +7,7 @@ Version: 4.1
 """
 
 import random
+from typing import Optional
 
 import aiohttp
 import disnake
@@ -98,6 +99,16 @@ class RockPaperScissorsView(disnake.ui.View):
 class Fun(commands.Cog, name="fun"):
     def __init__(self, bot):
         self.bot = bot
+        # Shared across requests so that connections to the API can be kept alive and reused.
+        # Created on first use, since it needs to be attached to the running event loop.
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def cog_unload(self) -> None:
+        """
+        Closes the HTTP session when the cog is removed from the bot.
+        """
+        if self._session is not None and not self._session.closed:
+            self.bot.loop.create_task(self._session.close())
 
     @commands.command(
         name="randomfact",
@@ -111,21 +122,22 @@ class Fun(commands.Cog, name="fun"):
         """
         # This will prevent your bot from stopping everything when doing a web request -
         # see: https://discordpy.readthedocs.io/en/stable/faq.html#how-do-i-make-a-web-request
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://uselessfacts.jsph.pl/random.json?language=en") as request:
-                if request.status == 200:
-                    data = await request.json()
-                    embed = disnake.Embed(
-                        description=data["text"],
-                        color=0xD75BF4
-                    )
-                else:
-                    embed = disnake.Embed(
-                        title="Error!",
-                        description="There is something wrong with the API, please try again later",
-                        color=0xE02B2B
-                    )
-                await context.send(embed=embed)
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        async with self._session.get("https://uselessfacts.jsph.pl/random.json?language=en") as request:
+            if request.status == 200:
+                data = await request.json()
+                embed = disnake.Embed(
+                    description=data["text"],
+                    color=0xD75BF4
+                )
+            else:
+                embed = disnake.Embed(
+                    title="Error!",
+                    description="There is something wrong with the API, please try again later",
+                    color=0xE02B2B
+                )
+            await context.send(embed=embed)
 
     @commands.command(
         name="coinflip",
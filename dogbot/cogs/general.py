@@ -6,20 +6,33 @@ This is a template to create your own discord bot in python.
 Version: 4.1
 """
 
+import asyncio
 import platform
 import random
+from typing import Optional
 
 import disnake
 from disnake import Member
 from disnake.ext import commands
 from disnake.ext.commands import Context, Bot
 
-from dogbot.helpers import checks
+from dogbot.helpers import checks, member_cache
 
 
 class General(commands.Cog, name="general"):
+    EIGHT_BALL_ANSWERS = ("It is certain.", "It is decidedly so.", "You may rely on it.", "Without a doubt.",
+                          "Yes - definitely.", "As I see, yes.", "Most likely.", "Outlook good.", "Yes.",
+                          "Signs point to yes.", "Reply hazy, try again.", "Ask again later.",
+                          "Better not tell you now.", "Cannot predict now.", "Concentrate and ask again later.",
+                          "Don't count on it.", "My reply is no.", "My sources say no.", "Outlook not so good.",
+                          "Very doubtful.")
+    """Answers that the magic 8 ball picks from."""
+
     def __init__(self, bot: Bot):
         self.bot: Bot = bot
+        # Formatted the first time they're needed, since they don't change once the bot is up and running.
+        self._command_prefixes: Optional[str] = None
+        self._available_commands: Optional[str] = None
 
     @commands.command(
         name="botinfo",
@@ -38,12 +51,11 @@ class General(commands.Cog, name="general"):
         embed.set_author(
             name="Dog Bot Information"
         )
-        owners: [Member] = []
-        for owner_id in self.bot.owner_ids:
-            owners.append(await context.guild.get_or_fetch_member(owner_id))
+        owners: list[Member] = await asyncio.gather(*(member_cache.get_or_fetch_member(context.guild, owner_id)
+                                                      for owner_id in self.bot.owner_ids))
         embed.add_field(
             name="Owner(s):",
-            value=", ".join(list(map(lambda owner: owner.name, owners))),
+            value=", ".join(owner.name for owner in owners),
             inline=True
         )
         embed.add_field(
@@ -51,15 +63,18 @@ class General(commands.Cog, name="general"):
             value=f"{platform.python_version()}",
             inline=True
         )
+        # All cogs have been loaded by the time a command can be used, so the commands won't change after this.
+        if self._available_commands is None:
+            self._command_prefixes = ", ".join(self.bot.command_prefix(self.bot, ""))
+            self._available_commands = ", ".join(command.name for command in self.bot.commands if not command.hidden)
         embed.add_field(
             name="Command Prefix(es):",
-            value=", ".join(self.bot.command_prefix(self.bot, "")),
+            value=self._command_prefixes,
             inline=False
         )
-        general_commands = filter(lambda command: not command.hidden, self.bot.commands)
         embed.add_field(
             name="Commands Available",
-            value=", ".join(list(map(lambda command: command.name, general_commands))),
+            value=self._available_commands,
             inline=False
         )
         embed.set_footer(
@@ -95,14 +110,9 @@ class General(commands.Cog, name="general"):
         :param context: The context in which the command has been executed.
         :param question: The question that should be asked by the user.
         """
-        answers = ["It is certain.", "It is decidedly so.", "You may rely on it.", "Without a doubt.",
-                   "Yes - definitely.", "As I see, yes.", "Most likely.", "Outlook good.", "Yes.",
-                   "Signs point to yes.", "Reply hazy, try again.", "Ask again later.", "Better not tell you now.",
-                   "Cannot predict now.", "Concentrate and ask again later.", "Don't count on it.", "My reply is no.",
-                   "My sources say no.", "Outlook not so good.", "Very doubtful."]
         embed = disnake.Embed(
             title="**My Answer:**",
-            description=f"{random.choice(answers)}",
+            description=f"{random.choice(self.EIGHT_BALL_ANSWERS)}",
             color=0x9C84EF
         )
         embed.set_footer(
@@ -6,8 +6,6 @@ This is a template to create your own discord bot in python.
 Version: 4.1
 """
 
-import json
-
 import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Context
@@ -73,12 +71,10 @@ class Owner(commands.Cog, name="owner"):
         Lets you add or remove a user from not being able to use the bot.
         """
         if context.invoked_subcommand is None:
-            blacklist_file = context.bot.config.blacklist_file_location
-            with open(blacklist_file) as file:
-                blacklist = json.load(file)
+            blacklisted_ids = checks.get_blacklisted_ids(context.bot.config.blacklist_file_location)
             embed = disnake.Embed(
-                title=f"There are currently {len(blacklist['ids'])} blacklisted IDs",
-                description=f"{', '.join(str(user_id) for user_id in blacklist['ids'])}",
+                title=f"There are currently {len(blacklisted_ids)} blacklisted IDs",
+                description=f"{', '.join(str(user_id) for user_id in sorted(blacklisted_ids))}",
                 color=0x9C84EF
             )
             await context.send(embed=embed)
@@ -94,25 +90,21 @@ class Owner(commands.Cog, name="owner"):
         try:
             user_id = member.id
             blacklist_file = context.bot.config.blacklist_file_location
-            with open(blacklist_file) as file:
-                blacklist = json.load(file)
-            if user_id in blacklist['ids']:
+            if user_id in checks.get_blacklisted_ids(blacklist_file):
                 embed = disnake.Embed(
                     title="Error!",
                     description=f"**{member.name}** is already in the blacklist.",
                     color=0xE02B2B
                 )
                 return await context.send(embed=embed)
-            json_manager.add_user_to_blacklist(blacklist_file, user_id)
+            blacklist_size = json_manager.add_user_to_blacklist(blacklist_file, user_id)
             embed = disnake.Embed(
                 title="User Blacklisted",
                 description=f"**{member.name}** has been successfully added to the blacklist",
                 color=0x9C84EF
             )
-            with open(blacklist_file) as file:
-                blacklist = json.load(file)
             embed.set_footer(
-                text=f"There are now {len(blacklist['ids'])} users in the blacklist"
+                text=f"There are now {blacklist_size} users in the blacklist"
             )
             await context.send(embed=embed)
         except:
@@ -134,16 +126,14 @@ class Owner(commands.Cog, name="owner"):
         try:
             user_id = member.id
             blacklist_file = context.bot.config.blacklist_file_location
-            json_manager.remove_user_from_blacklist(blacklist_file, user_id)
+            blacklist_size = json_manager.remove_user_from_blacklist(blacklist_file, user_id)
             embed = disnake.Embed(
                 title="User removed from blacklist",
                 description=f"**{member.name}** has been successfully removed from the blacklist",
                 color=0x9C84EF
             )
-            with open(blacklist_file) as file:
-                blacklist = json.load(file)
             embed.set_footer(
-                text=f"There are now {len(blacklist['ids'])} users in the blacklist"
+                text=f"There are now {blacklist_size} users in the blacklist"
             )
             await context.send(embed=embed)
         except:
@@ -5,6 +5,9 @@ from dataclasses import dataclass, field
 from os.path import dirname
 from typing import List
 
+# Where the dogbot package is located, which the default file locations are relative to.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 @dataclass
 class Config:
@@ -24,14 +27,13 @@ class Config:
 
     merge_with_config_file: bool = False
     """Whether the command line arguments should be merged on top of the configuration file."""
-    config_file_location: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+    config_file_location: str = os.path.join(_PACKAGE_DIR, 'config.json')
     """Path to the optional config file to merge the command line arguments into."""
 
     # These should change to be automatically generated by the app within a user-defined database folder location.
-    blacklist_file_location: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database',
-                                                'blacklist.json')
+    blacklist_file_location: str = os.path.join(_PACKAGE_DIR, 'database', 'blacklist.json')
     """Path to the blacklist file for restricting access."""
-    database_file_location: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'dog_bot.db')
+    database_file_location: str = os.path.join(_PACKAGE_DIR, 'database', 'dog_bot.db')
     """Path to the database file for storing data."""
 
     dog_act_votes: int = 5
@@ -82,15 +84,13 @@ def _merge_config_with_base(base_config: Config, new_config: Config) -> Config:
     :param new_config: Config to use as a source of truth. Non-falsy values will persist in the resultant Config.
     :return: A new merged config.
     """
-    # Generating the config as a dict prevents the developer from having to update it as config properties change.
-    merged_config = dataclasses.replace(base_config).__dict__
-    new_config_dict = new_config.__dict__
-
     # Merged config will use the new config entries when they are filled in, otherwise falls back to the base config
-    # values that it was defined with.
-    for config_field in new_config_dict:
-        if new_config_dict[config_field]:
-            merged_config[config_field] = new_config_dict[config_field]
+    # values that it was defined with. Going through the fields prevents the developer from having to update this as
+    # config properties change.
+    merged_config = {
+        config_field.name: getattr(new_config, config_field.name) or getattr(base_config, config_field.name)
+        for config_field in dataclasses.fields(Config)
+    }
 
     # Create a new config object by spreading our merged object as args.
     return Config(**merged_config)
@@ -1,17 +1,31 @@
+import logging
 import os
 import platform
 import random
+from typing import Callable, Any, Awaitable, Optional
 
 import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands, tasks
 from disnake.ext.commands import Context, Bot
-from peewee import SqliteDatabase
+from playhouse.pool import PooledSqliteDatabase
 
 from dogbot.config import Config
 from dogbot.exceptions.permissions import UserBlacklisted
 from dogbot.orm.database import dog_bot_database_proxy
 
+logger = logging.getLogger(__name__)
+
+# Statuses the bot picks from when updating its presence. Built once, since they never change.
+STATUSES = (disnake.Game("in the doghouse."),)
+
+# Sent whenever a blacklisted user tries to use a command. It's always the same, so it's only built once.
+BLACKLISTED_EMBED = disnake.Embed(
+    title="Error!",
+    description="You are blacklisted from using the bot.",
+    color=0xE02B2B
+)
+
 
 class DogBot(Bot):
     """
@@ -26,26 +40,47 @@ class DogBot(Bot):
         # We use a proxy db because we don't know where the db may be located.
         # This allows us to define the database location at runtime.
         # We also need to enable foreign keys in our db.
-        dog_bot_database_proxy.initialize(SqliteDatabase(config.database_file_location, pragmas={'foreign_keys': 1}))
+        # Write-ahead logging lets reads continue while a vote is being written, and with it a 'normal' sync level is
+        # still safe while avoiding a sync to disk on every commit.
+        # Connections are pooled so that queries run in worker threads reuse them rather than opening the file again.
+        # A pooled connection is only ever used by one thread at a time, but may be handed to a different thread once
+        # it's returned, so sqlite's same thread check has to be disabled. When every connection is in use, a thread
+        # waits for one to be returned rather than failing straight away.
+        # The temporary storage used for sorting and grouping is kept in memory, and the first 64MiB of the file is
+        # memory mapped so pages can be read without copying them.
+        dog_bot_database_proxy.initialize(PooledSqliteDatabase(config.database_file_location, pragmas={
+            'foreign_keys': 1,
+            'journal_mode': 'wal',
+            'synchronous': 'normal',
+            'cache_size': -8000,
+            'temp_store': 'memory',
+            'mmap_size': 64 * 1024 * 1024,
+        }, max_connections=8, stale_timeout=300, timeout=10, check_same_thread=False))
+
+    async def close(self) -> None:
+        """
+        Closes the connection to Discord, and then the database connections which are held open while the bot runs.
+        """
+        await super().close()
+        dog_bot_database_proxy.close()
+        dog_bot_database_proxy.close_all()
 
     @tasks.loop(minutes=1.0)
     async def status_task(self) -> None:
         """
         Update the game status task of the bot
         """
-        statuses = ["in the doghouse."]
-        await self.change_presence(activity=disnake.Game(random.choice(statuses)))
+        await self.change_presence(activity=random.choice(STATUSES))
 
     async def on_ready(self) -> None:
         """
         The code in this even is executed when the bot is ready.
         https://docs.disnake.dev/en/latest/api.html#disnake.on_ready
         """
-        print(f"Logged in as {self.user.name}")
-        print(f"disnake API version: {disnake.__version__}")
-        print(f"Python version: {platform.python_version()}")
-        print(f"Running on: {platform.system()} {platform.release()} ({os.name})")
-        print("-------------------")
+        logger.info("Logged in as %s", self.user.name)
+        logger.info("disnake API version: %s", disnake.__version__)
+        logger.info("Python version: %s", platform.python_version())
+        logger.info("Running on: %s %s (%s)", platform.system(), platform.release(), os.name)
         self.status_task.start()
 
     async def on_message(self, message: disnake.Message) -> None:
@@ -58,6 +93,10 @@ class DogBot(Bot):
         """
         if message.author == self.user or message.author.bot:
             return
+        # Commands always start with either the prefix or a mention of the bot (see main), so there's no need to build
+        # a context for any other message.
+        if not message.content.startswith((self.config.prefix, "<@")):
+            return
         await self.process_commands(message)
 
     async def on_slash_command(self, interaction: ApplicationCommandInteraction) -> None:
@@ -65,9 +104,8 @@ class DogBot(Bot):
         The code in this event is executed every time a slash command has been *successfully* executed.
         :param interaction: The slash command that has been executed.
         """
-        print(f"Executed {interaction.data.name} command "
-              f"in {interaction.guild.name} (ID: {interaction.guild.id}) "
-              f"by {interaction.author} (ID: {interaction.author.id})")
+        logger.info("Executed %s command in %s (ID: %s) by %s (ID: %s)", interaction.data.name,
+                    interaction.guild.name, interaction.guild.id, interaction.author, interaction.author.id)
 
     async def on_slash_command_error(self, interaction: ApplicationCommandInteraction, error: Exception) -> None:
         """
@@ -75,30 +113,10 @@ class DogBot(Bot):
         :param interaction: The slash command that failed executing.
         :param error: The error that has been faced.
         """
-        if isinstance(error, UserBlacklisted):
-            """
-            The code here will only execute if the error is an instance of 'UserBlacklisted', which can occur when using
-            the @checks.is_owner() check in your command, or you can raise the error by yourself.
-
-            'hidden=True' will make so that only the user who execute the command can see the message
-            """
-            embed = disnake.Embed(
-                title="Error!",
-                description="You are blacklisted from using the bot.",
-                color=0xE02B2B
-            )
-            print("A blacklisted user tried to execute a command.")
-            return await interaction.send(embed=embed, ephemeral=True)
-        elif isinstance(error, commands.errors.MissingPermissions):
-            embed = disnake.Embed(
-                title="Error!",
-                description="You are missing the permission(s) `" + ", ".join(
-                    error.missing_permissions) + "` to execute this command!",
-                color=0xE02B2B
-            )
-            print("A blacklisted user tried to execute a command.")
-            return await interaction.send(embed=embed, ephemeral=True)
-        raise error
+        handler = _find_error_handler(SLASH_COMMAND_ERROR_HANDLERS, error)
+        if handler is None:
+            raise error
+        await handler(interaction, error)
 
     async def on_command_completion(self, context: Context) -> None:
         """
@@ -108,9 +126,8 @@ class DogBot(Bot):
         full_command_name = context.command.qualified_name
         split = full_command_name.split(" ")
         executed_command = str(split[0])
-        print(f"Executed {executed_command} command "
-              f"in {context.guild.name} (ID: {context.message.guild.id}) "
-              f"by {context.message.author} (ID: {context.message.author.id})")
+        logger.info("Executed %s command in %s (ID: %s) by %s (ID: %s)", executed_command, context.guild.name,
+                    context.message.guild.id, context.message.author, context.message.author.id)
 
     async def on_command_error(self, context: Context, error) -> None:
         """
@@ -118,34 +135,126 @@ class DogBot(Bot):
         :param context: The normal command that failed executing.
         :param error: The error that has been faced.
         """
-        if isinstance(error, commands.CommandOnCooldown):
-            minutes, seconds = divmod(error.retry_after, 60)
-            hours, minutes = divmod(minutes, 60)
-            hours = hours % 24
-            embed = disnake.Embed(
-                title="Hey, please slow down!",
-                description=f"You can use this command again in "
-                            f"{f'{round(hours)} hours' if round(hours) > 0 else ''} "
-                            f"{f'{round(minutes)} minutes' if round(minutes) > 0 else ''} "
-                            f"{f'{round(seconds)} seconds' if round(seconds) > 0 else ''}.",
-                color=0xE02B2B
-            )
-            await context.send(embed=embed)
-        elif isinstance(error, commands.MissingPermissions):
-            embed = disnake.Embed(
-                title="Error!",
-                description="You are missing the permission(s) `"
-                            f"{', '.join(error.missing_permissions)}"
-                            "` to execute this command!",
-                color=0xE02B2B
-            )
-            await context.send(embed=embed)
-        elif isinstance(error, commands.MissingRequiredArgument):
-            embed = disnake.Embed(
-                title="Error!",
-                # We need to capitalize because the command arguments have no capital letter in the code.
-                description=str(error).capitalize(),
-                color=0xE02B2B
-            )
-            await context.send(embed=embed)
+        handler = _find_error_handler(COMMAND_ERROR_HANDLERS, error)
+        if handler is not None:
+            await handler(context, error)
         raise error
+
+
+def _find_error_handler(handlers: dict[type[Exception], Callable[[Any, Any], Awaitable[None]]],
+                        error: Exception) -> Optional[Callable[[Any, Any], Awaitable[None]]]:
+    """
+    Finds how to let the user know about an error.
+
+    :param handlers: How to handle each type of error, keyed by the type of error.
+    :param error: The error that has been faced.
+    :return: How to handle the error, or None if it isn't handled.
+    """
+    # Most errors are raised as exactly the type that's handled, so try a direct lookup before checking subclasses.
+    handler = handlers.get(type(error))
+    if handler is None:
+        handler = next((error_handler for error_type, error_handler in handlers.items()
+                        if isinstance(error, error_type)), None)
+    return handler
+
+
+async def _send_cooldown_error(context: Context, error: commands.CommandOnCooldown) -> None:
+    """
+    Lets the user know how long they need to wait before they can use the command again.
+
+    :param context: The normal command that failed executing.
+    :param error: The cooldown that prevented the command from executing.
+    """
+    minutes, seconds = divmod(error.retry_after, 60)
+    hours, minutes = divmod(minutes, 60)
+    hours = hours % 24
+    # Only mention the units of time that are left to wait.
+    wait_parts = [f"{amount} {unit}" for amount, unit in
+                  zip(map(round, (hours, minutes, seconds)), ("hours", "minutes", "seconds")) if amount > 0]
+    embed = disnake.Embed(
+        title="Hey, please slow down!",
+        description=f"You can use this command again in {' '.join(wait_parts) or '0 seconds'}.",
+        color=0xE02B2B
+    )
+    await context.send(embed=embed)
+
+
+async def _send_missing_permissions_error(context: Context, error: commands.MissingPermissions) -> None:
+    """
+    Lets the user know which permissions they need in order to execute the command.
+
+    :param context: The normal command that failed executing.
+    :param error: The permissions that the user was missing.
+    """
+    await context.send(embed=_create_missing_permissions_embed(error))
+
+
+def _create_missing_permissions_embed(error: commands.MissingPermissions) -> disnake.Embed:
+    """
+    :param error: The permissions that the user was missing.
+    :return: An embed telling the user which permissions they need in order to execute the command.
+    """
+    return disnake.Embed(
+        title="Error!",
+        description="You are missing the permission(s) `"
+                    f"{', '.join(error.missing_permissions)}"
+                    "` to execute this command!",
+        color=0xE02B2B
+    )
+
+
+async def _send_missing_argument_error(context: Context, error: commands.MissingRequiredArgument) -> None:
+    """
+    Lets the user know which argument they forgot to provide.
+
+    :param context: The normal command that failed executing.
+    :param error: The argument that was missing.
+    """
+    embed = disnake.Embed(
+        title="Error!",
+        # We need to capitalize because the command arguments have no capital letter in the code.
+        description=str(error).capitalize(),
+        color=0xE02B2B
+    )
+    await context.send(embed=embed)
+
+
+# How to let the user know about normal command errors, keyed by the type of error being handled.
+COMMAND_ERROR_HANDLERS: dict[type[commands.CommandError], Callable[[Context, Any], Awaitable[None]]] = {
+    commands.CommandOnCooldown: _send_cooldown_error,
+    commands.MissingPermissions: _send_missing_permissions_error,
+    commands.MissingRequiredArgument: _send_missing_argument_error,
+}
+
+
+async def _send_slash_blacklisted_error(interaction: ApplicationCommandInteraction, _: UserBlacklisted) -> None:
+    """
+    Lets a blacklisted user know that they can't use the bot. This can occur when using the @checks.not_blacklisted()
+    check in a command, or the error can be raised directly.
+    The message is ephemeral, so that only the user who executed the command can see it.
+
+    :param interaction: The slash command that failed executing.
+    :param _: The blacklisting that prevented the command from executing.
+    """
+    logger.info("A blacklisted user tried to execute a command.")
+    await interaction.send(embed=BLACKLISTED_EMBED, ephemeral=True)
+
+
+async def _send_slash_missing_permissions_error(interaction: ApplicationCommandInteraction,
+                                                error: commands.MissingPermissions) -> None:
+    """
+    Lets the user know which permissions they need in order to execute the slash command.
+
+    :param interaction: The slash command that failed executing.
+    :param error: The permissions that the user was missing.
+    """
+    logger.info("A user without the required permissions tried to execute a command.")
+    await interaction.send(embed=_create_missing_permissions_embed(error), ephemeral=True)
+
+
+# How to let the user know about slash command errors, keyed by the type of error being handled.
+SLASH_COMMAND_ERROR_HANDLERS: dict[type[Exception],
+                                   Callable[[ApplicationCommandInteraction, Any], Awaitable[None]]] = {
+    UserBlacklisted: _send_slash_blacklisted_error,
+    commands.MissingPermissions: _send_slash_missing_permissions_error,
+}
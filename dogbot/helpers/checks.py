@@ -6,23 +6,44 @@ This is a template to create your own discord bot in python.
 Version: 4.1
 """
 
-import json
 from typing import TypeVar, Callable
 
 from disnake.ext import commands
 
 from dogbot.exceptions.permissions import UserNotOwner, UserBlacklisted
+from dogbot.helpers import json_cache
 
 T = TypeVar("T")
 
 
+def get_blacklisted_ids(file_location: str) -> frozenset[int]:
+    """
+    Retrieves the IDs of the blacklisted users, only reading the blacklist file if it has changed since it was last
+    read. This check runs for most commands, so the file shouldn't be read every time.
+
+    :param file_location: Where to find the blacklist file.
+    :return: The IDs of every blacklisted user.
+    """
+    return json_cache.load(file_location, _parse_blacklisted_ids)
+
+
+def _parse_blacklisted_ids(blacklist: dict) -> frozenset[int]:
+    """
+    Pulls the IDs of the blacklisted users out of the contents of the blacklist file.
+
+    :param blacklist: Parsed contents of the blacklist file.
+    :return: The IDs of every blacklisted user.
+    """
+    return frozenset(blacklist["ids"])
+
+
 def is_owner() -> Callable[[T], T]:
     """
     This is a custom check to see if the user executing the command is an owner of the bot.
     """
 
     async def predicate(context: commands.Context) -> bool:
-        if context.author.id not in context.bot.config.owners:
+        if context.author.id not in context.bot.owner_ids:
             raise UserNotOwner
         return True
 
@@ -35,9 +56,7 @@ def not_blacklisted() -> Callable[[T], T]:
     """
 
     async def predicate(context: commands.Context) -> bool:
-        with open(context.bot.config.blacklist_file_location) as file:
-            data = json.load(file)
-        if context.author.id in data["ids"]:
+        if context.author.id in get_blacklisted_ids(context.bot.config.blacklist_file_location):
             raise UserBlacklisted
         return True
 
@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Converted file contents keyed by the file and how it was converted, along with the modification time and size of
+# the file when it was read. The file is read again as soon as either of them changes.
+_cache: dict[tuple[str, Callable[[Any], Any]], tuple[int, int, Any]] = {}
+
+
+def load(file_location: str, convert: Callable[[Any], T]) -> T:
+    """
+    Loads a JSON file and converts its contents, only reading the file again once it has changed.
+
+    :param file_location: Where to find the JSON file.
+    :param convert: Turns the parsed contents of the file into what should be cached and returned.
+    :return: The converted contents of the file.
+    """
+    stat = os.stat(file_location)
+    key = (file_location, convert)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(file_location) as file:
+        converted = convert(json.load(file))
+    _cache[key] = (stat.st_mtime_ns, stat.st_size, converted)
+    return converted
+
+
+def invalidate(file_location: str) -> None:
+    """
+    Forgets the contents of a JSON file, so that it's read again the next time it's loaded.
+    Should be called after the file is written to, in case the change happened too quickly to be noticed.
+
+    :param file_location: Where to find the JSON file.
+    """
+    for key in [key for key in _cache if key[0] == file_location]:
+        del _cache[key]
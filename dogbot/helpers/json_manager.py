@@ -8,32 +8,42 @@ Version: 4.1
 
 import json
 
+from dogbot.helpers import json_cache
 
-def add_user_to_blacklist(file_location: str, user_id: int) -> None:
+
+def add_user_to_blacklist(file_location: str, user_id: int) -> int:
     """
     This function will add a user based on its ID in the blacklist.json file.
 
     :param file_location: Where to find the blacklist file.
     :param user_id: The ID of the user that should be added into the blacklist.json file.
+    :return: How many users are in the blacklist now that the user has been added.
     """
     with open(file_location, "r+") as file:
         file_data = json.load(file)
         file_data["ids"].append(user_id)
-    with open(file_location, "w") as file:
+        # Overwrite the file in place, rather than opening it a second time to write.
         file.seek(0)
         json.dump(file_data, file, indent=4)
+        file.truncate()
+    json_cache.invalidate(file_location)
+    return len(file_data["ids"])
 
 
-def remove_user_from_blacklist(file_location: str, user_id: int) -> None:
+def remove_user_from_blacklist(file_location: str, user_id: int) -> int:
     """
     This function will remove a user based on its ID from the blacklist.json file.
 
     :param file_location: Where to find the blacklist file.
     :param user_id: The ID of the user that should be removed from the blacklist.json file.
+    :return: How many users are in the blacklist now that the user has been removed.
     """
-    with open(file_location, "r") as file:
+    with open(file_location, "r+") as file:
         file_data = json.load(file)
         file_data["ids"].remove(user_id)
-    with open(file_location, "w") as file:
+        # Overwrite the file in place, rather than opening it a second time to write.
         file.seek(0)
         json.dump(file_data, file, indent=4)
+        file.truncate()
+    json_cache.invalidate(file_location)
+    return len(file_data["ids"])
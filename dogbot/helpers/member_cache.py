@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Iterable
+
+from disnake import Guild, Member
+
+MEMBER_CACHE_TTL_SEC = 5 * 60
+"""How long a fetched member is reused for before fetching it again, so that name changes are eventually picked up."""
+MEMBER_CACHE_MAX_SIZE = 1024
+"""Maximum number of members to remember at once. The least recently used member is forgotten first."""
+
+# Members that have already been fetched, keyed by the guild and member IDs, along with when they expire.
+_member_cache: OrderedDict[tuple[int, int], tuple[float, Member]] = OrderedDict()
+
+
+def _get_cached_member(guild_id: int, member_id: int) -> Optional[Member]:
+    """
+    Retrieves a member that was recently fetched, if it hasn't expired.
+
+    :param guild_id: Guild that the member belongs to.
+    :param member_id: Member to retrieve.
+    :return: The cached member, or None if they need to be fetched.
+    """
+    key = (guild_id, member_id)
+    entry = _member_cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, member = entry
+    if expires_at < time.monotonic():
+        del _member_cache[key]
+        return None
+
+    _member_cache.move_to_end(key)
+    return member
+
+
+def _cache_member(guild_id: int, member: Member) -> None:
+    """
+    Remembers a fetched member, forgetting the least recently used member if the cache is full.
+
+    :param guild_id: Guild that the member belongs to.
+    :param member: Member to remember.
+    """
+    key = (guild_id, member.id)
+    _member_cache[key] = (time.monotonic() + MEMBER_CACHE_TTL_SEC, member)
+    _member_cache.move_to_end(key)
+    if len(_member_cache) > MEMBER_CACHE_MAX_SIZE:
+        _member_cache.popitem(last=False)
+
+
+async def get_or_fetch_member(guild: Guild, member_id: int) -> Optional[Member]:
+    """
+    Retrieves a member of the guild, only asking Discord for them if they haven't been fetched recently.
+
+    :param guild: Guild that the member belongs to.
+    :param member_id: Member to retrieve.
+    :return: The member, or None if they couldn't be found.
+    """
+    member = _get_cached_member(guild.id, member_id)
+    if member is None:
+        member = await guild.get_or_fetch_member(member_id)
+        if member is not None:
+            _cache_member(guild.id, member)
+    return member
+
+
+async def get_or_fetch_members(guild: Guild, member_ids: Iterable[int]) -> list[Member]:
+    """
+    Retrieves members of the guild, only asking Discord for those that haven't been fetched recently.
+
+    :param guild: Guild that the members belong to.
+    :param member_ids: Members to retrieve.
+    :return: The members that could be found, in no particular order.
+    """
+    members: list[Member] = []
+    missing_member_ids: list[int] = []
+    for member_id in member_ids:
+        member = _get_cached_member(guild.id, member_id)
+        if member is None:
+            missing_member_ids.append(member_id)
+        else:
+            members.append(member)
+
+    if missing_member_ids:
+        for member in await guild.get_or_fetch_members(missing_member_ids):
+            _cache_member(guild.id, member)
+            members.append(member)
+    return members
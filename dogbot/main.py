@@ -1,24 +1,41 @@
-import os
+import asyncio
+import logging
+import pkgutil
 import sys
 
 import disnake
 from disnake.ext import commands
 from disnake.ext.commands import DefaultHelpCommand
 
+import dogbot.cogs
 from dogbot.config import Config
 from dogbot.extensions.dog_bot import DogBot
 
+# uvloop has a faster event loop, but is optional since it isn't available everywhere (e.g. Windows).
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
 
 def main(config: Config):
     """
     Runs the bot, loading in commands and applying config.
     :param config: Configuration options to apply to the bot.
     """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # The faster event loop needs to be in place before the bot is created, since that's when the event loop is set up.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Validate that what we need is available.
     try:
         config.validate()
     except (FileNotFoundError, ValueError) as e:
-        print(e)
+        logger.error(e)
         sys.exit(1)
 
     # Since we're using prefixed commands (not slash) we need to declare our intent.
@@ -27,20 +44,19 @@ def main(config: Config):
 
     bot = DogBot(command_prefix=commands.when_mentioned_or(config.prefix), intents=intents,
                  help_command=DefaultHelpCommand(width=120),
-                 token=config.token, owner_ids=config.owners, config=config)
+                 token=config.token, owner_ids=set(config.owners), config=config)
 
-    # Load the bot commands This finds any files in the cogs folder adjacent to where this file is located, and sources.
-    for command_file in os.listdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cogs')):
+    # Load the bot commands. This finds any modules in the cogs package, and sources them in name order.
+    for command_module in pkgutil.iter_modules(dogbot.cogs.__path__):
         # Load in any python files that aren't metadata files.
-        if command_file.endswith('.py') and not command_file.startswith('__'):
-            command_file = command_file[:-3]
+        if not command_module.ispkg and not command_module.name.startswith('__'):
+            command_file = command_module.name
             try:
                 # This needs to be the location of the cog as if you were to import it.
                 bot.load_extension(f'dogbot.cogs.{command_file}')
-                print(f'Loaded user commands from "{command_file}"')
+                logger.info('Loaded user commands from "%s"', command_file)
             except Exception as e:
-                exception = f"{type(e).__name__}: {e}"
-                print(f'Failed to load user commands from "{command_file}"\n{exception}')
+                logger.error('Failed to load user commands from "%s"\n%s: %s', command_file, type(e).__name__, e)
 
     # Run the bot with the token.
     bot.run(config.token)
@@ -1,10 +1,13 @@
-from typing import Union
+import asyncio
+from typing import Union, Optional, Iterable
 
 from disnake.ext.commands import Context
 
-from orm.models.dog_act import DogAct
-from orm.models.member import Member
-from orm.models.votes import YesVote, NoVote
+from dogbot.helpers import member_cache
+from dogbot.orm.database import dog_bot_database_proxy
+from dogbot.orm.models.dog_act import DogAct
+from dogbot.orm.models.member import Member
+from dogbot.orm.models.votes import Vote
 
 
 class DogActController:
@@ -12,47 +15,75 @@ class DogActController:
     Controller for the provided Dog Act model, containing helper methods to update and modify it.
     The controller pattern has been used to avoid circular imports, and centralise the logic for handling dog acts.
     """
+    __slots__ = ("dog_act", "_yes_votes", "_no_votes", "_message_prefix", "_reporter_mention", "_target_mention")
+
     dog_act: DogAct
+    _yes_votes: Optional[set[int]]
+    """IDs of the members that voted 'yes' on the dog act. Loaded on first use."""
+    _no_votes: Optional[set[int]]
+    """IDs of the members that voted 'no' on the dog act. Loaded on first use."""
+    _message_prefix: Optional[str]
+    """Part of the dog act message that doesn't change between votes. Generated on first use."""
+    _reporter_mention: Optional[str]
+    """How to mention the member that reported the dog act. Looked up on first use."""
+    _target_mention: Optional[str]
+    """How to mention the member accused in the dog act. Looked up on first use."""
 
     def __init__(self, dog_act: DogAct):
         """
         :param dog_act: Dog act that this controller will be focused on.
         """
         self.dog_act = dog_act
+        self._yes_votes = None
+        self._no_votes = None
+        self._message_prefix = None
+        self._reporter_mention = None
+        self._target_mention = None
 
     def set_message_id(self, message_id: int) -> None:
         self.dog_act.message_id = message_id
 
-    def add_new_yes_vote(self, author: int) -> None:
+    def add_new_yes_vote(self, author: int) -> bool:
         """
-        Updates the vote for the provided author to be a 'yes' vote.
+        Updates the vote for the provided author to be a 'yes' vote, unless they have already voted 'yes'.
         If the vote count reaches the threshold, this finds the target guilty.
 
         :param author: Discord Member to be added to the 'yes' list.
+        :returns: Whether the vote changed anything.
         """
-        # Get or create returns the resultant entry, and a bool indicating whether it was existent.
-        # we only want the result.
-        member = Member.get_or_create(id=author)[0]
-        self._clear_votes_for_author(member)
-        YesVote.create(dog_act=self.dog_act.id, member=member.id)
+        # Voting the same way twice doesn't change anything, so there's nothing to update.
+        self._load_votes()
+        if author in self._yes_votes:
+            return False
+
+        self._cast_vote(author, True)
+        self._no_votes.discard(author)
+        self._yes_votes.add(author)
         self.update_guilt()
+        return True
 
-    def add_new_no_vote(self, author: int) -> None:
+    def add_new_no_vote(self, author: int) -> bool:
         """
-        Updates the vote for the provided author to be a 'no' vote.
+        Updates the vote for the provided author to be a 'no' vote, unless they have already voted 'no'.
 
         :param author: Discord Member to be added to the 'no' list.
+        :returns: Whether the vote changed anything.
         """
-        member = Member.get_or_create(id=author)[0]
-        self._clear_votes_for_author(member)
-        NoVote.create(dog_act=self.dog_act.id, member=member.id)
+        self._load_votes()
+        if author in self._no_votes:
+            return False
+
+        self._cast_vote(author, False)
+        self._yes_votes.discard(author)
+        self._no_votes.add(author)
+        return True
 
     def update_guilt(self) -> None:
         """
         Updates the record of guilt for this dog act based on whether the yes vote count is high enough.
         """
-        yes_vote_count = YesVote.select().where(YesVote.dog_act == self.dog_act).count()
-        if yes_vote_count >= self.dog_act.required_votes:
+        self._load_votes()
+        if len(self._yes_votes) >= self.dog_act.required_votes:
             self.dog_act.found_guilty = True
 
     def time_out(self) -> None:
@@ -65,11 +96,36 @@ class DogActController:
         """
         Reset the voting on this dog act.
         """
-        YesVote.delete().where(YesVote.dog_act == self.dog_act.id).execute()
-        NoVote.delete().where(NoVote.dog_act == self.dog_act.id).execute()
+        Vote.delete().where(Vote.dog_act == self.dog_act.id).execute()
+        self._yes_votes = set()
+        self._no_votes = set()
         self.dog_act.found_guilty = False
         self.dog_act.timed_out = False
 
+    def get_votes(self) -> tuple[frozenset[int], frozenset[int]]:
+        """
+        :returns: IDs of the members that voted 'yes' on this dog act, and IDs of those that voted 'no'.
+        """
+        self._load_votes()
+        return frozenset(self._yes_votes), frozenset(self._no_votes)
+
+    def restore_votes(self, yes_votes: Iterable[int], no_votes: Iterable[int]) -> None:
+        """
+        Replaces the votes cast on this dog act with the provided ones, such as those from before the voting was reset.
+        The members must have voted before, so that they already exist.
+
+        :param yes_votes: IDs of the members that voted 'yes'.
+        :param no_votes: IDs of the members that voted 'no'.
+        """
+        self._yes_votes = set(yes_votes)
+        self._no_votes = set(no_votes)
+        votes = [{'dog_act': self.dog_act.id, 'member': member_id, 'is_yes': True} for member_id in self._yes_votes]
+        votes.extend({'dog_act': self.dog_act.id, 'member': member_id, 'is_yes': False} for member_id in self._no_votes)
+        with dog_bot_database_proxy.atomic():
+            Vote.delete().where(Vote.dog_act == self.dog_act.id).execute()
+            if votes:
+                Vote.insert_many(votes).execute()
+
     def begin_appeal_and_save(self, reason: str) -> None:
         """
         Reinitialises this dog act, marking it as an appeal and providing the reason it's being appealed.
@@ -78,6 +134,8 @@ class DogActController:
         """
         self.dog_act.appeal_attempted = True
         self.dog_act.appeal_reason = reason
+        # The introduction to the dog act message changes for an appeal.
+        self._message_prefix = None
 
         # An appeal attempt needs to be saved straight away, or multiple could occur at the same time!
         self.dog_act.save()
@@ -90,8 +148,9 @@ class DogActController:
                   True when the vote succeeds,
                   None when not enough votes have been cast.
         """
-        yes_vote_count = YesVote.select().where(YesVote.dog_act == self.dog_act).count()
-        no_vote_count = NoVote.select().where(NoVote.dog_act == self.dog_act).count()
+        self._load_votes()
+        yes_vote_count = len(self._yes_votes)
+        no_vote_count = len(self._no_votes)
         if no_vote_count >= self.dog_act.required_votes or self.dog_act.timed_out:
             return False
         elif yes_vote_count >= self.dog_act.required_votes:
@@ -106,20 +165,25 @@ class DogActController:
         :param context: Discord context about the user interaction that lead to this method being called.
         :returns: An up-to-date representation of the status of this dog act.
         """
-        yes_vote_count = YesVote.select().where(YesVote.dog_act == self.dog_act).count()
-        no_vote_count = NoVote.select().where(NoVote.dog_act == self.dog_act).count()
-        reporter_member = await context.guild.get_or_fetch_member(self.dog_act.reporter)
-        target_member = await context.guild.get_or_fetch_member(self.dog_act.target)
+        self._load_votes()
+        yes_vote_count = len(self._yes_votes)
+        no_vote_count = len(self._no_votes)
 
-        if self.dog_act.appeal_attempted:
-            introduction = f"Someone is appealing this dog act on the grounds '{self.dog_act.appeal_reason}'.\n"
-        else:
-            introduction = f"Whoah there {reporter_member.mention}, that's a big claim!\n"
+        # Only the vote counts change between votes, so everything before them is generated once.
+        if self._message_prefix is None:
+            await self._load_mentions(context)
+
+            if self.dog_act.appeal_attempted:
+                introduction = f"Someone is appealing this dog act on the grounds '{self.dog_act.appeal_reason}'.\n"
+            else:
+                introduction = f"Whoah there {self._reporter_mention}, that's a big claim!\n"
+
+            self._message_prefix = (
+                    introduction +
+                    f"Who agrees that {self._target_mention} was really a :dog: for '{self.dog_act.allegation}'?\n"
+                    f"Votes required on one side for a verdict: {self.dog_act.required_votes}\n")
 
-        return (introduction +
-                f"Who agrees that {target_member.mention} was really a :dog: for '{self.dog_act.allegation}'?\n"
-                f"Votes required on one side for a verdict: {self.dog_act.required_votes}\n"
-                f"Current votes: "
+        return (f"{self._message_prefix}Current votes: "
                 f":dog: Guilty - {yes_vote_count}, "
                 f":no_entry_sign: Not Guilty - {no_vote_count}")
 
@@ -130,31 +194,69 @@ class DogActController:
         :param context: Discord context about the user interaction that lead to this method being called.
         :return: Whether the target is guilty or innocent.
         """
-        reporter_member = await context.guild.get_or_fetch_member(self.dog_act.reporter)
-        target_member = await context.guild.get_or_fetch_member(self.dog_act.target)
+        await self._load_mentions(context)
 
         # If we're in the middle of an appeal, timing out isn't a good thing.
         if self.dog_act.appeal_attempted:
             timeout_text = "Appeal denied due to lack of participation!"
         else:
-            timeout_text = f"{target_member.mention} has been found innocent due to lack of voter participation!"
+            timeout_text = f"{self._target_mention} has been found innocent due to lack of voter participation!"
 
         if self.dog_act.found_guilty:
-            return f"{target_member.mention} has been found guilty of being a :dog: for '{self.dog_act.allegation}'!"
+            return f"{self._target_mention} has been found guilty of being a :dog: for '{self.dog_act.allegation}'!"
         elif self.dog_act.timed_out:
             return timeout_text
         else:
-            return f"{target_member.mention} has been found innocent! Shame on {reporter_member.mention}"
+            return f"{self._target_mention} has been found innocent! Shame on {self._reporter_mention}"
 
-    def _clear_votes_for_author(self, author: Member) -> None:
+    async def _load_mentions(self, context: Context) -> None:
+        """
+        Looks up the reporter and target of this dog act and stores how to mention them, if it hasn't been done already.
+        The members involved never change, so this only needs to happen once per controller.
+
+        :param context: Discord context about the user interaction that lead to this method being called.
         """
-        Removes all votes previously made by the provided author from any relevant lists.
-        Doesn't update the database.
+        if self._reporter_mention is not None:
+            return
+        # Use the raw IDs, since the foreign key accessors would load each Member from the database first.
+        # Both members are requested together so that any that aren't cached are fetched in a single request.
+        reporter_id = self.dog_act.reporter_id
+        target_id = self.dog_act.target_id
+        members = {member.id: member for member in
+                   await member_cache.get_or_fetch_members(context.guild, {reporter_id, target_id})}
+        self._reporter_mention = members[reporter_id].mention
+        self._target_mention = members[target_id].mention
+
+    def _load_votes(self) -> None:
+        """
+        Loads the votes cast on this dog act into memory, if they haven't been already.
+        Keeping track of who voted which way means checking for a member's vote doesn't need a query.
+        """
+        if self._yes_votes is not None:
+            return
+        self._yes_votes = set()
+        self._no_votes = set()
+        for member_id, is_yes_vote in Vote.select(Vote.member, Vote.is_yes).where(
+                Vote.dog_act == self.dog_act.id).tuples():
+            if is_yes_vote:
+                self._yes_votes.add(member_id)
+            else:
+                self._no_votes.add(member_id)
+
+    def _cast_vote(self, author: int, is_yes: bool) -> None:
+        """
+        Records the vote of the provided author, replacing any vote they previously made on this dog act.
 
-        :param author: Discord Member to be removed.
+        :param author: ID of the Discord Member casting the vote.
+        :param is_yes: Whether the vote is for the target being guilty.
         """
-        YesVote.delete().where((YesVote.dog_act == self.dog_act.id) & (YesVote.member == author.id)).execute()
-        NoVote.delete().where((NoVote.dog_act == self.dog_act.id) & (NoVote.member == author.id)).execute()
+        # The member needs to exist for the vote to reference them, but there's no need to fetch them.
+        # A member only has one vote on a dog act, so changing it updates the existing row in place rather than
+        # deleting it and inserting another.
+        with dog_bot_database_proxy.atomic():
+            Member.insert(id=author).on_conflict_ignore().execute()
+            Vote.insert(dog_act=self.dog_act.id, member=author, is_yes=is_yes).on_conflict(
+                conflict_target=[Vote.dog_act, Vote.member], preserve=[Vote.is_yes]).execute()
 
     async def create_detailed_outcome_message(self, context: Context) -> str:
         """
@@ -164,34 +266,32 @@ class DogActController:
         :param context: Discord context about the user interaction that lead to this method being called.
         :returns: Information about the dog act.
         """
-        yes_votes_db_list: [int] = []
-        for yes_votes_db in YesVote.select().where(YesVote.dog_act == self.dog_act.id).iterator():
-            yes_votes_db_list.append(yes_votes_db.member.id)
-        no_votes_db_list: [int] = []
-        for no_votes_db in NoVote.select().where(NoVote.dog_act == self.dog_act.id).iterator():
-            no_votes_db_list.append(no_votes_db.member.id)
-        yes_voters = await context.guild.get_or_fetch_members(yes_votes_db_list)
-        no_voters = await context.guild.get_or_fetch_members(no_votes_db_list)
-
-        def get_voter_name(user: Member):
-            return user.name
-
-        guilty_voters: list[str] = list(map(get_voter_name, yes_voters))
-        not_guilty_voters: list[str] = list(map(get_voter_name, no_voters))
+        self._load_votes()
+        # Every voter is requested at once so that any that aren't cached are fetched in a single request, while the
+        # outcome message looks up the reporter and target at the same time.
+        voters, outcome_message = await asyncio.gather(
+            member_cache.get_or_fetch_members(context.guild, [*self._yes_votes, *self._no_votes]),
+            self.create_outcome_message(context))
+        voter_names = {voter.id: voter.name for voter in voters}
+
+        # Voters that couldn't be found (e.g. they've left the server) are left out.
+        guilty_voters: list[str] = [voter_names[voter_id] for voter_id in self._yes_votes if voter_id in voter_names]
+        not_guilty_voters: list[str] = [voter_names[voter_id] for voter_id in self._no_votes if voter_id in voter_names]
 
         return (f"Dog act {self.dog_act.id} finalised. "
-                f"Verdict: {await self.create_outcome_message(context)}. "
+                f"Verdict: {outcome_message}. "
                 f"Guilty voters: {guilty_voters}, Not guilty voters: {not_guilty_voters}")
 
-    def create_history_summary(self) -> str:
+    def create_history_summary(self, yes_vote_count: int, no_vote_count: int) -> str:
         """
         Creates a historical summary for this dog act, to show what the main outcomes of the act were.
+        The vote counts are provided rather than counted here, so that they can be loaded alongside many dog acts at
+        once.
 
+        :param yes_vote_count: How many 'yes' votes were cast on this dog act.
+        :param no_vote_count: How many 'no' votes were cast on this dog act.
         :return: A summary of the outcome of this dog act.
         """
-        yes_vote_count = YesVote.select().where(YesVote.dog_act == self.dog_act).count()
-        no_vote_count = NoVote.select().where(NoVote.dog_act == self.dog_act).count()
-
         if self.dog_act.found_guilty:
             verdict = "Guilty"
         elif self.dog_act.timed_out:
@@ -36,5 +36,4 @@ class RepeatingIntegerField(Field):
         if type(value) is int:
             return [value]
 
-        split_values = value.split(",")
-        return list(map(lambda str_value: int(str_value), split_values))
+        return [int(str_value) for str_value in value.split(",")]
@@ -0,0 +1,20 @@
+from peewee import Table, Value
+
+from dogbot.orm.database import dog_bot_database_proxy
+from dogbot.orm.models.votes import Vote
+
+
+def merge_split_vote_tables() -> None:
+    """
+    Older versions of the bot kept 'yes' and 'no' votes in separate tables. Moves any votes in those tables into the
+    :class:`Vote` table, and then drops them.
+    The :class:`Vote` table needs to have been created first.
+    """
+    with dog_bot_database_proxy.atomic():
+        for table_name, is_yes in (('yesvote', True), ('novote', False)):
+            if not dog_bot_database_proxy.table_exists(table_name):
+                continue
+            old_votes = Table(table_name, ('dog_act_id', 'member_id'))
+            Vote.insert_from(old_votes.select(old_votes.dog_act_id, old_votes.member_id, Value(is_yes)),
+                             [Vote.dog_act, Vote.member, Vote.is_yes]).on_conflict_ignore().execute()
+            dog_bot_database_proxy.execute_sql(f'DROP TABLE "{table_name}"')
@@ -11,5 +11,7 @@ class BaseModel(Model):
     class Meta:
         """
         Tell this model and all child models to use the db defined globally.
+        Saving an existing row only writes the fields that have changed since it was loaded.
         """
         database = dog_bot_database_proxy
+        only_save_dirty = True
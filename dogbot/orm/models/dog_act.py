@@ -1,7 +1,7 @@
-from peewee import IntegerField, AutoField, CharField, BooleanField, ForeignKeyField
+from peewee import IntegerField, BigIntegerField, AutoField, CharField, BooleanField, ForeignKeyField
 
 from dogbot.orm.models.base_model import BaseModel
-from orm.models.member import Member
+from dogbot.orm.models.member import Member
 
 
 class DogAct(BaseModel):
@@ -9,8 +9,9 @@ class DogAct(BaseModel):
     Represents an instance in which users cast votes to determine whether a specific act should be considered dog.
     """
     id: int = AutoField()
-    message_id: int = IntegerField(null=True, help_text="Unique identifier for the bot message that this relates to.")
-    guild_id: int = IntegerField(help_text="Guild (discord server) that this act occurred within.")
+    message_id: int = BigIntegerField(null=True,
+                                      help_text="Unique identifier for the bot message that this relates to.")
+    guild_id: int = BigIntegerField(help_text="Guild (discord server) that this act occurred within.")
     reporter: int = ForeignKeyField(model=Member, help_text="Who it was that filed this report against the target.")
     target: int = ForeignKeyField(model=Member, help_text="The user accused of being a dog.")
     allegation: str = CharField(
@@ -25,3 +26,14 @@ class DogAct(BaseModel):
                                           help_text="Whether someone has attempted to appeal this dog act before.")
     appeal_reason: str = CharField(default="",
                                    help_text="If an appeal has been attempted, why it should be considered.")
+
+    class Meta:
+        """
+        Index the columns that the leaderboard and history filter on, so they don't need to scan every dog act.
+        """
+        indexes = (
+            # Top dogs on a server: filtered by guild and guilt, grouped by target.
+            (('guild_id', 'found_guilty', 'target'), False),
+            # Dog history for a member on a server, newest first.
+            (('guild_id', 'target', 'id'), False),
+        )
@@ -1,10 +1,11 @@
-from peewee import IntegerField
+from peewee import BigIntegerField
 
-from orm.models.base_model import BaseModel
+from dogbot.orm.models.base_model import BaseModel
 
 
 class Member(BaseModel):
     """
     Representation of a Discord member.
     """
-    id: int = IntegerField(primary_key=True, help_text="Unique user identifier for this Member, as present in Discord.")
+    id: int = BigIntegerField(primary_key=True,
+                              help_text="Unique user identifier for this Member, as present in Discord.")
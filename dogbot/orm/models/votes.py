@@ -1,21 +1,20 @@
-from peewee import ForeignKeyField
+from peewee import ForeignKeyField, BooleanField
 
-from orm.models.base_model import BaseModel
-from orm.models.dog_act import DogAct
-from orm.models.member import Member
+from dogbot.orm.models.base_model import BaseModel
+from dogbot.orm.models.dog_act import DogAct
+from dogbot.orm.models.member import Member
 
 
-class YesVote(BaseModel):
+class Vote(BaseModel):
     """
-    A 'yes' vote on a specified :class:`DogAct`, from the attached :class:`Member`.
+    A vote on a specified :class:`DogAct`, from the attached :class:`Member`, on whether the target is guilty.
     """
     dog_act: int = ForeignKeyField(DogAct, help_text='Dog act being voted upon.')
     member: int = ForeignKeyField(Member, help_text='Discord member that cast this vote.')
+    is_yes: bool = BooleanField(help_text='Whether this is a vote for the target being guilty.')
 
-
-class NoVote(BaseModel):
-    """
-    A 'no' vote on a specified :class:`DogAct`, from the attached :class:`Member`.
-    """
-    dog_act: int = ForeignKeyField(DogAct, help_text='Dog act being voted upon.')
-    member: int = ForeignKeyField(Member, help_text='Discord member that cast this vote.')
+    class Meta:
+        """
+        A member can only have one vote on a dog act. Also used to find a member's vote on a dog act.
+        """
+        indexes = ((('dog_act', 'member'), True),)
@@ -1,38 +1,78 @@
-from typing import List
+import os
+import re
+from typing import Iterator, List, Optional
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
-with open('README.md') as f:
-    readme = f.read()
+# Tools that are only needed to build the package, which shouldn't be forced upon anyone installing it.
+BUILD_ONLY_DEPENDENCIES = frozenset({'setuptools', 'wheel', 'pip', 'build'})
 
-with open('LICENSE.md') as f:
-    project_license = f.read()
+# A comment, either taking up the whole line or following a dependency, as pip understands them.
+_COMMENT_PATTERN = re.compile(r'(^|\s+)#.*$')
+# Including another requirements file, in any of the spellings pip accepts.
+_INCLUDE_PATTERN = re.compile(r'(?:-r|--requirement)[\s=]*(?P<file>\S.*)')
+# Where a dependency's project name ends, such as at the start of its version specifier, extras or environment markers.
+_NAME_PATTERN = re.compile(r'[\s<>=!~;\[]')
+
+
+def _read_lines(file: str) -> Iterator[str]:
+    """
+    Reads a requirements file one line at a time, without any comments or surrounding whitespace.
+
+    :param file: Path to the requirements file.
+    :return: The contents of each line, skipping any that are empty.
+    """
+    with open(file) as fh:
+        for line in fh:
+            line = _COMMENT_PATTERN.sub('', line).strip()
+            if line:
+                yield line
+
+
+def _get_included_file(line: str) -> Optional[str]:
+    """
+    :param line: Line of a requirements file.
+    :return: The requirements file that the line includes, or None if it's a dependency.
+    """
+    match = _INCLUDE_PATTERN.fullmatch(line)
+    return match.group('file') if match is not None else None
 
 
 def get_deps_from_file(file: str) -> List[str]:
+    """
+    Reads the runtime dependencies listed in a requirements file, leaving out any that are only needed for building.
+    Any other files included with '-r' are followed, and each is only read once however many files include it.
+
+    :param file: Path to the requirements file.
+    :return: Every runtime dependency listed, in order.
+    """
+    file = os.path.abspath(file)
     deps = []
-    with open(file) as fh:
-        for dep in fh.read().splitlines():
-            if dep.startswith("-r"):
-                deps.extend(get_deps_from_file(dep.split(" ")[1]))
-            else:
-                deps.append(dep)
+    seen_files = {file}
+    # Files that are part way through being read, most recently included last. Reading the last one first means the
+    # dependencies in an included file keep the place of the line that included them.
+    files_being_read = [(os.path.dirname(file), _read_lines(file))]
+    while files_being_read:
+        directory, lines = files_being_read[-1]
+        line = next(lines, None)
+        if line is None:
+            files_being_read.pop()
+            continue
+
+        included_file = _get_included_file(line)
+        if included_file is None:
+            if _NAME_PATTERN.split(line, maxsplit=1)[0].lower() not in BUILD_ONLY_DEPENDENCIES:
+                deps.append(line)
+            continue
+
+        # Included files are relative to the file that includes them, as they are for pip.
+        included_file = os.path.normpath(os.path.join(directory, included_file))
+        if included_file not in seen_files:
+            seen_files.add(included_file)
+            files_being_read.append((os.path.dirname(included_file), _read_lines(included_file)))
     return deps
 
 
 REQUIRED_DEPENDENCIES = get_deps_from_file('requirements.txt')
-setup(
-    name='dogbot',
-    version='0.1.0',
-    description='Python bot for putting an alleged "dog" user through the judiciary system '
-                'to determine guilt or innocence.',
-    long_description=readme,
-    author='James McDowell',
-    url='https://github.com/wejrox/Discord-Dog-Bot-Py',
-    license=project_license,
-    packages=find_packages(),
-    install_requires=REQUIRED_DEPENDENCIES,
-    entry_points={
-        'console_scripts': ['dogbot = dogbot.__main__:console_entry']
-    }
-)
+# Everything else about the package is declared in pyproject.toml.
+setup(install_requires=REQUIRED_DEPENDENCIES)